@@ -8,8 +8,97 @@ Our data files are stored outside this repository because they are too large,
 so users need to specify the path to their data.
 """
 import os
+import re
+from collections import OrderedDict
+from functools import partial
+from io import BytesIO
+from multiprocessing.pool import ThreadPool
 
+import numpy as np
 import pandas as pd
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+    _HAS_PYARROW = True
+except ImportError:
+    _HAS_PYARROW = False
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+try:
+    _STRING_TYPES = (str, unicode)
+except NameError:
+    _STRING_TYPES = (str,)
+
+# SALib labels reaction rate parameters 'rxn', but our inputs file uses 'k'
+_RXN = re.compile('rxn', re.IGNORECASE)
+
+# Blank line between the first/total and second order blocks of an analysis
+# file.  Files are read as bytes, so allow for Windows (CRLF) line endings.
+_BLANK_LINE = re.compile(br'\r?\n[ \t]*\r?\n')
+
+# Leading/trailing whitespace on a line, and runs of spaces or tabs between
+# fields, which are normalised before parsing with pyarrow
+_EDGE_SPACE = re.compile(br'(?m)^[ \t]+|[ \t]+(?=\r?$)')
+_SPACE_RUN = re.compile(br'[ \t]{2,}|\t')
+
+# Analysis files skipped by get_sa_data by default.  These two functional
+# groups are not present in the light oil fraction of our lignin modeling
+# dataset.
+EXCLUDED_ANALYSIS_FILES = frozenset(['analysis_light_aromatic-C-C.txt',
+                                     'analysis_light_aromatic-methoxyl.txt'])
+
+# Number of entries kept in each of the caches below
+_CACHE_SIZE = 8
+
+# Results of get_sa_data, keyed on the absolute path of the folder.  At most
+# _CACHE_SIZE folders are kept.
+_SA_CACHE = OrderedDict()
+
+# Column names of local files read by read_file, keyed on (absolute path,
+# sep).  At most _CACHE_SIZE entries are kept.
+_HEADER_CACHE = OrderedDict()
+
+
+def _cache_put(cache, key, value):
+    """
+    Store value in cache (an OrderedDict) as its most recently used entry,
+    dropping the least recently used so no more than _CACHE_SIZE are kept.
+    """
+    cache.pop(key, None)
+    cache[key] = value
+    while len(cache) > _CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+def _is_local_file(path):
+    """Is path the name of an existing file (rather than a URL or buffer)?"""
+    return isinstance(path, _STRING_TYPES) and os.path.isfile(path)
+
+
+def _read_header(path, sep):
+    """
+    Return the list of column names in the local file at path.  Headers are
+    cached until the file's modification time changes.
+    """
+    key = (os.path.abspath(path), sep)
+    mtime = os.path.getmtime(path)
+    cached = _HEADER_CACHE.get(key)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, list(pd.read_csv(path, sep=sep, nrows=0).columns))
+    _cache_put(_HEADER_CACHE, key, cached)
+
+    return cached[1]
+
+
+def _check_columns(names, header):
+    """Raise a KeyError if any of names are not in header."""
+    missing = [name for name in names if name not in header]
+    if missing:
+        raise KeyError('%s not found in the columns of the file' % missing)
 
 
 def read_file(path, numrows=None, drop=False, sep=','):
@@ -28,11 +117,12 @@ def read_file(path, numrows=None, drop=False, sep=','):
                 number of rows of the file to read.
                 If you don't specify this parameter all rows
                 will be read.
-    drop      : list, optional
+    drop      : list or str, optional
                 list of strings indicating which (if any)
                 of the named columns you do not want to include
                 in the resulting dataframe. (ex. ['cats', 'dogs'],
-                default is not to drop any rows).
+                default is not to drop any columns).  A KeyError is
+                raised if any of these columns are not in the file.
     sep       : str
                 string indicating the column separator in the
                 file (optional, default = ',').
@@ -45,13 +135,92 @@ def read_file(path, numrows=None, drop=False, sep=','):
          columns named in "drop".
     """
 
-    df = pd.read_csv(path, sep=sep, nrows=numrows)
-    if not drop:
-        df.drop(drop, axis=1, inplace=True)
+    if isinstance(drop, _STRING_TYPES):
+        drop = [drop]
+
+    # Only parse the columns we are keeping, so dropped columns are never
+    # loaded into memory.  This needs the header first, so it is only done
+    # for local files; other inputs (URLs, open file objects) are read once
+    # and the columns are dropped afterwards.
+    local = _is_local_file(path)
+    usecols = None
+    if drop and local:
+        header = _read_header(path, sep)
+        _check_columns(drop, header)
+        drop = frozenset(drop)
+        usecols = [col for col in header if col not in drop]
+
+    df = pd.read_csv(path, sep=sep, nrows=numrows, usecols=usecols)
+    if drop and not local:
+        _check_columns(drop, df.columns)
+        df = df.drop(list(drop), axis=1)
 
     return df
 
 
+def _read_sa_table(data):
+    """
+    Parse one whitespace separated block (bytes) of a SALib analysis file
+    into a pandas dataframe, using the multithreaded pyarrow reader if it is
+    installed and the pandas C parser otherwise.
+    """
+    if _HAS_PYARROW:
+        # pyarrow only splits on a single delimiter character, so tidy up
+        # the whitespace first to give the same columns as the pandas parser
+        if _has_irregular_spaces(data):
+            data = _SPACE_RUN.sub(b' ', _EDGE_SPACE.sub(b'', data))
+        table = pa_csv.read_csv(
+            pa.py_buffer(data),
+            parse_options=pa_csv.ParseOptions(delimiter=' '))
+        return table.to_pandas(self_destruct=True)
+
+    # pandas hands a '\s+' separator to its C tokenizer's whitespace mode
+    # rather than the regex based python engine
+    return pd.read_csv(BytesIO(data), sep=r'\s+')
+
+
+def _has_irregular_spaces(data):
+    """
+    Are the fields in data separated by anything other than single spaces?
+    Uses plain substring searches so the common case stays fast.
+    """
+    return (b'  ' in data or b'\t' in data or b'\n ' in data or
+            b' \n' in data or b' \r' in data or
+            data[:1] == b' ' or data[-1:] == b' ')
+
+
+if _HAS_NUMBA:
+    @njit(cache=True)
+    def _shift_negative_kernel(values, conf, floor):
+        """Single pass, in place version of _shift_negative for numba."""
+        for i in range(values.shape[0]):
+            if values[i] < 0.0:
+                conf[i] = conf[i] + values[i] - floor
+                values[i] = floor
+
+
+def _shift_negative(df, column, floor=0.0001):
+    """
+    Replace negative values of `column` in df with `floor` and adjust the
+    matching `column`_conf confidence interval to account for the shift.
+    The dataframe is modified in place.
+    """
+    if _HAS_NUMBA:
+        # work on float64 copies so the kernel can update them in place
+        values = df[column].values.astype(np.float64)
+        conf = df[column + '_conf'].values.astype(np.float64)
+        _shift_negative_kernel(values, conf, floor)
+        df[column + '_conf'] = conf
+        df[column] = values
+        return
+
+    values = df[column].values
+    conf = df[column + '_conf'].values
+    negative = values < 0
+    df[column + '_conf'] = np.where(negative, conf + values - floor, conf)
+    df[column] = np.where(negative, floor, values)
+
+
 def get_params(path='./input_parameters.csv',
                numrows=None, drop=['End_time', 'Oxygen']):
     """
@@ -116,7 +285,89 @@ def get_results(path='./results.csv',
     return read_file(path, numrows=numrows, drop=drop)
 
 
-def get_sa_data(path='.'):
+def _is_analysis_file(filename, exclude):
+    """Should filename be read by get_sa_data()?"""
+    return filename.startswith('analysis') and filename not in exclude
+
+
+def _list_analysis_files(path, exclude):
+    """
+    Return a sorted list of the analysis files in the directory at path,
+    other than those in exclude, in a single pass over the directory entries.
+    """
+    # os.scandir (Python 3.5+) gets the file type from the directory entry
+    # instead of a separate stat call per file
+    if hasattr(os, 'scandir'):
+        return sorted(entry.name for entry in os.scandir(path)
+                      if _is_analysis_file(entry.name, exclude) and
+                      entry.is_file())
+
+    return sorted(filename for filename in os.listdir(path)
+                  if _is_analysis_file(filename, exclude) and
+                  os.path.isfile(os.path.join(path, filename)))
+
+
+def _read_sa_file(path, filename):
+    """
+    Read a single SALib analysis file and return a tuple with the name of
+    the output measure and a list of the first/total order dataframe and the
+    second order dataframe (or False if there are no second order indices).
+    """
+    name = filename[9:].replace('.txt', '')
+
+    with open(os.path.join(path, filename), 'rb') as result:
+        data = result.read()
+    # The first/total indices are separated from the second order
+    # indices (if present) by a blank line
+    split = _BLANK_LINE.search(data)
+    second = data[split.end():] if split else b''
+    if second and not second.isspace():
+        sens = [_read_sa_table(data[:split.start()]), _read_sa_table(second)]
+    else:
+        sens = [_read_sa_table(data), False]
+
+    # Deal with negative values.  All negative values appear to be close
+    # to zero already; they are the result of machine precision issues or
+    # setting n too low when generating parameter sets.  To properly
+    # correct this issue you should re-run your model with n greater,
+    # but sometimes that is too expensive so this is a hack to allow
+    # display of them in a logical way.
+    # .
+    _shift_negative(sens[0], 'S1')
+    # do the same for total and second order indices
+    _shift_negative(sens[0], 'ST')
+    if isinstance(sens[1], pd.DataFrame):
+        _shift_negative(sens[1], 'S2')
+
+    # Change 'rxn' to 'k' for consistency with inputs file
+    sens[0]['Parameter'] = [_RXN.sub('k', param)
+                            for param in sens[0]['Parameter'].values]
+
+    return name, sens
+
+
+def _file_signature(filename):
+    """
+    Return (filename, size, modification time) for a file, used to tell when
+    a cached result is out of date.  The size catches rewrites within one
+    tick of a filesystem with coarse timestamps; st_mtime_ns is only
+    available from Python 3.3, so older versions use st_mtime.
+    """
+    stat = os.stat(filename)
+    return (filename, stat.st_size,
+            getattr(stat, 'st_mtime_ns', stat.st_mtime))
+
+
+def _copy_sa_data(sens_dfs):
+    """Return a copy of a get_sa_data() dictionary and its dataframes."""
+    return OrderedDict((name, [sens[0].copy(),
+                               sens[1].copy()
+                               if isinstance(sens[1], pd.DataFrame)
+                               else False])
+                       for name, sens in sens_dfs.items())
+
+
+def get_sa_data(path='.', exclude=EXCLUDED_ANALYSIS_FILES):
     """
     This function reads and processes all the sensitivity analysis results
     in a specified folder and returns a dictionary with the corresponding
@@ -126,10 +377,10 @@ def get_sa_data(path='.'):
     Sensitivity analysis results should be in the default SALib output
     format and must start with the word 'analysis'.
 
-    NOTE: there are two lines of code at the beginning of this function
-    (the filenames.remove lines) that are specific to our lignin modeling
-    dataset.  Future users can remove or modify these lines to use
-    with other datasets.
+    NOTE: by default the files named in `EXCLUDED_ANALYSIS_FILES` are
+    skipped.  These are specific to our lignin modeling dataset; future
+    users can pass their own `exclude` (or exclude=()) to use with other
+    datasets.
 
     Parameters
     -----------
@@ -142,14 +393,17 @@ def get_sa_data(path='.'):
            one sensitivity analysis project, and if second order sensitivity
            indices are included in any of the files they should be present in
            all the others.
+    exclude : set, optional
+              Names of analysis files in path that should not be read
+              (default is `EXCLUDED_ANALYSIS_FILES`).
 
     Returns
     --------
-    sens_dfs : dict
+    sens_dfs : OrderedDict
                Dictionary where keys are the names of the various output
                measures (one output measure per analysis file in the folder
-               specified by path).  Dictionary values are a list of pandas
-               dataframes.
+               specified by path), in sorted filename order.  Dictionary
+               values are a list of pandas dataframes.
 
                sens_dfs['key'][0] is a dataframe with the first and total
                order indices of all the parameters with respect to the "key"
@@ -160,74 +414,40 @@ def get_sa_data(path='.'):
                present in the analysis file).  If there are no second order
                results in the analysis file then this value is a boolean,
                False.
+
+               Results for recently read folders are cached until one of
+               their analysis files changes size or modification time; each
+               call returns new copies of the dataframes.
     """
 
-    filenames = [filename for filename in os.listdir(
-                 path) if filename.startswith('analysis')]
+    filenames = _list_analysis_files(path, frozenset(exclude))
 
-    # These two functional groups are not present in the light oil fraction
-    if 'analysis_light_aromatic-C-C.txt' in filenames:
-        filenames.remove('analysis_light_aromatic-C-C.txt')
-    if 'analysis_light_aromatic-methoxyl.txt' in filenames:
-        filenames.remove('analysis_light_aromatic-methoxyl.txt')
+    # Reuse the parsed results from a previous call if none of the analysis
+    # files in this folder have been added, removed or modified since.
+    # Callers get copies, so changes they make never reach the cache.
+    key = os.path.abspath(path)
+    signature = tuple(_file_signature(os.path.join(path, filename))
+                      for filename in filenames)
+    cached = _SA_CACHE.get(key)
+    if cached is not None and cached[0] == signature:
+        _cache_put(_SA_CACHE, key, cached)
+        return _copy_sa_data(cached[1])
 
     # Make a dictionary where keys are the different output measures
     # (one for each analysis file) and values are lists of dataframes
     # with the first/total analysis results, and the second order results.
-    sens_dfs = {}
-    for filename in filenames:
-        name = filename[9:].replace('.txt', '')
-
-        with open(path + filename) as result:
-            contents = []
-            contents.append(result.readlines())
-            # find the line number in the file where 2nd order results appear
-            for j, line in enumerate(contents[0]):
-                # End this loop when you reach the line that separates
-                # the first/total indices from the second order indices
-                if line.startswith('\n'):
-                    break
-                # If no second order indices in file
-                else:
-                    j = False
-            # If there are second order indices in the file
-            if j:
-                sens_dfs[name] = [pd.read_csv(path + filename, sep=' ',
-                                              nrows=(j - 1)),
-                                  pd.read_csv(path + filename, sep=' ',
-                                              skiprows=j)
-                                  ]
-            else:
-                sens_dfs[name] = [pd.read_csv(path + filename, sep=' '),
-                                  False]
-
-        # Deal with negative values.  All negative values appear to be close
-        # to zero already; they are the result of machine precision issues or
-        # setting n too low when generating parameter sets.  To properly
-        # correct this issue you should re-run your model with n greater,
-        # but sometimes that is too expensive so this is a hack to allow
-        # display of them in a logical way.
-        # .
-        # adjust confidence interval to account for shifting sensitivity value
-        sens_dfs[name][0].ix[sens_dfs[name][0]['S1'] < 0, 'S1_conf'] = (
-            sens_dfs[name][0]['S1_conf'] + sens_dfs[name][0]['S1'] - 0.0001)
-        # set the new sensitivity value = 0.0001
-        sens_dfs[name][0].ix[sens_dfs[name][0]['S1'] < 0, 'S1'] = 0.0001
-        # do the same for total and second order indices
-        sens_dfs[name][0].ix[sens_dfs[name][0]['ST'] < 0, 'ST_conf'] = (
-            sens_dfs[name][0]['ST_conf'] + sens_dfs[name][0]['ST'] - 0.0001)
-        sens_dfs[name][0].ix[sens_dfs[name][0]['ST'] < 0, 'ST'] = 0.0001
-        if isinstance(sens_dfs[name][1], pd.DataFrame):
-            sens_dfs[name][1].ix[sens_dfs[name][1]['S2'] < 0, 'S2_conf'] = (
-                sens_dfs[name][1]['S2_conf'] + sens_dfs[name][1]['S2'] -
-                0.0001)
-            sens_dfs[name][1].ix[sens_dfs[name][1]['S2'] < 0, 'S2'] = 0.0001
-
-        # Change 'rxn' to 'k' for consistency with inputs file
-        sens_dfs[name][0].Parameter = (sens_dfs[name][0].Parameter
-                                       .str.replace('rxn', 'k', case=False))
-
-    return sens_dfs
+    # The files are independent and CSV parsing releases the GIL, so they
+    # are read concurrently.
+    pool = ThreadPool(max(1, min(8, len(filenames))))
+    try:
+        sens_dfs = OrderedDict(pool.map(partial(_read_sa_file, path),
+                                        filenames))
+    finally:
+        pool.close()
+        pool.join()
+    _cache_put(_SA_CACHE, key, (signature, sens_dfs))
+
+    return _copy_sa_data(sens_dfs)
 
 
 def find_unimportant_params(header='ST', path='.'):
@@ -264,7 +484,7 @@ def find_unimportant_params(header='ST', path='.'):
         df = sa_dict[key][0]
         zero_params.append(df[(df[header] == 0.0) &
                               (df['%s_conf' % header] == 0.0)]
-                           .ix[:, 'Parameter'].values.tolist())
+                           ['Parameter'].values.tolist())
 
     result = set(zero_params[0])
     for s in zero_params[1:]:
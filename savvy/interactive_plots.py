@@ -14,7 +14,7 @@ ipywidgets
 collections
 
 """
-from bokeh.models.widgets import Panel, Tabs
+from bokeh.models.widgets import Panel, Paragraph, Tabs
 from bokeh.plotting import show
 from ipywidgets import BoundedFloatText, IntText, Checkbox, SelectMultiple
 from IPython.html.widgets import interact, fixed
@@ -25,7 +25,7 @@ import warnings; warnings.filterwarnings('ignore')
 
 def plot_all_outputs(sa_dict, demo=False, min_val=0.01, top=100, stacked=True,
                      error_bars=True, log_axis=True,
-                     highlighted_parameters=[]):
+                     highlighted_parameters=[], lazy=False):
     """
     This function calls plotting.make_plot() for all the sensitivity
     analysis output files and lets you choose which output to view
@@ -57,35 +57,58 @@ def plot_all_outputs(sa_dict, demo=False, min_val=0.01, top=100, stacked=True,
     highlighted_parameters : list, optional
                              List of strings indicating which parameter wedges
                              will be highlighted.
+    lazy                   : bool, optional
+                             Boolean indicating if only the active tab is
+                             plotted up front (True), with the others plotted
+                             the first time they are selected.  Tab callbacks
+                             only run in a Bokeh server, so with lazy=True the
+                             tabs are returned instead of shown; add them to
+                             a server document with
+                             `curdoc().add_root(tabs)`.  Default is False.
 
     Returns
     --------
     p : bokeh plot
         a Bokeh plot generated with plotting.make_plot() that includes tabs
-        for all the possible outputs.
+        for all the possible outputs.  If lazy=True this is the (unshown)
+        bokeh Tabs widget.
     """
 
-    tabs_dictionary = {}
-    outcomes_array = []
+    outcomes = list(sa_dict.items())
     if demo:
-        for files in sa_dict.keys()[0:2]:
-            outcomes_array.append(sa_dict[files][0])
+        outcomes = outcomes[0:2]
+
+    def render(i):
+        return make_plot(outcomes[i][1][0],
+                         top=top,
+                         minvalues=min_val,
+                         stacked=stacked,
+                         errorbar=error_bars,
+                         lgaxis=log_axis,
+                         highlight=highlighted_parameters
+                         )
+
+    if not lazy:
+        tabs = Tabs(tabs=[Panel(child=render(i), title=name)
+                          for i, (name, sens) in enumerate(outcomes)])
     else:
-        for files in sa_dict.keys():
-            outcomes_array.append(sa_dict[files][0])
-
-    for i in range(len(outcomes_array)):
-        p = make_plot(outcomes_array[i],
-                      top=top,
-                      minvalues=min_val,
-                      stacked=stacked,
-                      errorbar=error_bars,
-                      lgaxis=log_axis,
-                      highlight=highlighted_parameters
-                      )
-        tabs_dictionary[i] = Panel(child=p, title=sa_dict.keys()[i])
-
-    tabs = Tabs(tabs=tabs_dictionary.values())
+        tabs = Tabs(tabs=[Panel(child=Paragraph(text='Loading...'),
+                                title=name)
+                          for name, sens in outcomes])
+        rendered = set()
+
+        def activate(attr, old, new):
+            # each tab is plotted at most once
+            if new not in rendered:
+                tabs.tabs[new].child = render(new)
+                rendered.add(new)
+
+        if outcomes:
+            activate('active', None, tabs.active)
+        tabs.on_change('active', activate)
+
+        return tabs
+
     p = show(tabs)
 
     return p
@@ -123,6 +146,7 @@ def interact_with_plot_all_outputs(sa_dict, demo=False, manual=True):
     return interact(plot_all_outputs,
                     sa_dict=fixed(sa_dict),
                     demo = fixed(demo),
+                    lazy=fixed(False),
                     min_val=min_val_box,
                     top=top_box,
                     stacked=stacks,
@@ -156,21 +180,15 @@ def plot_all_second_order(sa_dict, top=5, mirror=True, include=[]):
         a Bokeh plot that includes tabs for all the possible outputs.
     """
 
-    tabs_dictionary = {}
-    outcomes_array = []
-
-    for files in sa_dict.keys():
-        outcomes_array.append(sa_dict[files][1])
-
-    for i in range(len(sa_dict)):
-        p = make_second_order_heatmap(outcomes_array[i],
-                                      top=top,
-                                      mirror=mirror,
-                                      include=include
-                                      )
-        tabs_dictionary[i] = Panel(child=p, title=sa_dict.keys()[i])
+    tabs_list = [Panel(child=make_second_order_heatmap(sens[1],
+                                                       top=top,
+                                                       mirror=mirror,
+                                                       include=include
+                                                       ),
+                       title=name)
+                 for name, sens in sa_dict.items()]
 
-    tabs = Tabs(tabs=tabs_dictionary.values())
+    tabs = Tabs(tabs=tabs_list)
     p = show(tabs)
 
     return p
@@ -263,46 +263,31 @@ def make_plot(dataframe=pd.DataFrame(), highlight=[],
         #                                              index=df.index)
         inner_rad = np.ones_like(angles)*inner_radius
         df[cols[statistic]+'lower'] = df[cols[statistic]+'lower'].fillna(90)
-    # Store plotted values into dictionary to be add glyphs
+
+    # Store plotted values into dictionary to be add glyphs.  Columns are
+    # pulled out as plain arrays once and joined with np.concatenate, ST
+    # first and then S1.
+    def st_then_s1(column):
+        return np.concatenate((df[cols[1] + column].values,
+                               df[cols[0] + column].values))
+
     pdata = pd.DataFrame({
-                         'x': np.append(np.zeros_like(inner_rad),
-                                        np.zeros_like(inner_rad)),
-                         'y': np.append(np.zeros_like(inner_rad),
-                                        np.zeros_like(inner_rad)),
+                         'x': np.zeros(2 * len(inner_rad)),
+                         'y': np.zeros(2 * len(inner_rad)),
                          'ymin': np.append(inner_rad, inner_rad),
-                         'ymax': pd.Series.append(df[cols[1]+'radial'],
-                                                  df[cols[0]+'radial']
-                                                  ).reset_index(drop=True),
-                         'starts': pd.Series.append(df[cols[1] +
-                                                    '_start_angle'],
-                                                    df[cols[0] +
-                                                    '_start_angle']
-                                                    ).reset_index(drop=True),
-                         'stops': pd.Series.append(df[cols[1] +
-                                                      '_stop_angle'],
-                                                   df[cols[0] +
-                                                      '_stop_angle']
-                                                   ).reset_index(drop=True),
-                         'Param': pd.Series.append(df.Parameter,
-                                                       df.Parameter
-                                                   ).reset_index(drop=True),
+                         'ymax': st_then_s1('radial'),
+                         'starts': st_then_s1('_start_angle'),
+                         'stops': st_then_s1('_stop_angle'),
+                         'Param': np.append(df.Parameter.values,
+                                            df.Parameter.values),
                          'Colors': np.append(sTcolor, s1color),
                          'Error Colors': np.append(errsTcolor, errs1color),
-                         'Conf': pd.Series.append(df.ST_conf,
-                                                        df.S1_conf
-                                                  ).reset_index(drop=True),
+                         'Conf': st_then_s1('_conf'),
                          'Order': np.append(totalorder, firstorder),
-                         'Sens': pd.Series.append(df.ST, df.S1
-                                                  ).reset_index(drop=True),
-                         'Lower': pd.Series.append(df.STlower,
-                                                   df.S1lower
-                                                   ).reset_index(drop=True),
-                         'Upper': pd.Series.append(df.STupper,
-                                                   df.S1upper,
-                                                   ).reset_index(drop=True),
-                         'Err_Angle': pd.Series.append(df.ST_err_angle,
-                                                       df.S1_err_angle,
-                                                       ).reset_index(drop=True)
+                         'Sens': st_then_s1(''),
+                         'Lower': st_then_s1('lower'),
+                         'Upper': st_then_s1('upper'),
+                         'Err_Angle': st_then_s1('_err_angle'),
                          })
     # removed S1 or ST values if indicated by input
     if showS1 is False:
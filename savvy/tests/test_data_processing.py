@@ -1,5 +1,7 @@
 import unittest
 import os.path as op
+import shutil
+import tempfile
 
 from pandas.util.testing import assert_frame_equal
 try:
@@ -8,7 +10,9 @@ except:
     import pickle
 
 import savvy
-from ..data_processing import get_sa_data, find_unimportant_params
+from .. import data_processing
+from ..data_processing import (read_file, get_sa_data,
+                               find_unimportant_params)
 
 path = op.join(savvy.__path__[0], 'sample_data_files/')
 
@@ -16,9 +20,76 @@ path = op.join(savvy.__path__[0], 'sample_data_files/')
 comps = pickle.load(open(path + 'unittest_comparisons.pkl', 'rb'))
 
 
+def _write_modified_sample(tmpdir, transform,
+                           filename='analysis_sample-output1.txt'):
+    """
+    Write a copy of a sample analysis file into tmpdir, with its contents
+    (bytes) passed through transform, and return the new file's name.
+    """
+    with open(path + filename, 'rb') as f:
+        data = f.read()
+    with open(op.join(tmpdir, filename), 'wb') as f:
+        f.write(transform(data))
+    return filename
+
+
+class TestReadFile(unittest.TestCase):
+    """Tests for read_file()"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.csv = op.join(self.tmpdir, 'params.csv')
+        with open(self.csv, 'w') as f:
+            f.write('k1,k2,End_time,Oxygen\n1,2,3,4\n5,6,7,8\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_drop_columns(self):
+        """Are the columns listed in drop left out?"""
+        df = read_file(self.csv, drop=['End_time', 'Oxygen'])
+        self.assertEqual(list(df.columns), ['k1', 'k2'])
+        self.assertEqual(df['k2'].tolist(), [2, 6])
+
+    def test_drop_false_keeps_all_columns(self):
+        """Are all columns kept when drop=False?"""
+        df = read_file(self.csv, drop=False)
+        self.assertEqual(list(df.columns), ['k1', 'k2', 'End_time', 'Oxygen'])
+
+    def test_drop_single_string(self):
+        """Is a single column name treated as one column, not letters?"""
+        df = read_file(self.csv, drop='Oxygen')
+        self.assertEqual(list(df.columns), ['k1', 'k2', 'End_time'])
+
+    def test_drop_from_file_object(self):
+        """Can columns be dropped when reading from an open file?"""
+        with open(self.csv) as f:
+            df = read_file(f, drop=['End_time', 'Oxygen'])
+        self.assertEqual(list(df.columns), ['k1', 'k2'])
+
+    def test_multicharacter_separator(self):
+        """Can files with a multi-character separator be read?"""
+        sep_csv = op.join(self.tmpdir, 'params_sep.csv')
+        with open(sep_csv, 'w') as f:
+            f.write('k1::k2::Oxygen\n1::2::3\n')
+        df = read_file(sep_csv, drop=['Oxygen'], sep='::')
+        self.assertEqual(list(df.columns), ['k1', 'k2'])
+        self.assertEqual(df['k2'].tolist(), [2])
+
+    def test_drop_unknown_column_raises(self):
+        """Is an error raised if drop names a column not in the file?"""
+        self.assertRaises(KeyError, read_file, self.csv, drop=['cats'])
+
+
 class TestGetSAData(unittest.TestCase):
     """Tests for get_sa_data()"""
 
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
     def test_returns_expected_dict(self):
         """Does get_sa_data() return the expected dictionaries (tests
         multiple)?"""
@@ -40,6 +111,94 @@ class TestGetSAData(unittest.TestCase):
         self.assertIsNone(assert_frame_equal(df5, df6),
                           msg='The `sample-output3` dataframes do not match')
 
+    def test_keys_are_sorted(self):
+        """Are output measures returned in sorted filename order?"""
+        self.assertEqual(list(get_sa_data(path)),
+                         ['sample-output1', 'sample-output2'])
+
+    def test_exclude_files(self):
+        """Are analysis files named in exclude skipped?"""
+        sa_dict = get_sa_data(path, exclude=['analysis_sample-output2.txt'])
+        self.assertEqual(list(sa_dict.keys()), ['sample-output1'])
+
+    def test_crlf_line_endings(self):
+        """Are analysis files with Windows line endings read correctly?"""
+        _write_modified_sample(self.tmpdir,
+                               lambda data: data.replace(b'\n', b'\r\n'))
+        sens = get_sa_data(self.tmpdir)['sample-output1']
+        assert_frame_equal(sens[0], comps[0]['sample-output1'][0])
+        assert_frame_equal(sens[1], comps[0]['sample-output1'][1])
+
+    def test_cached_results_are_not_shared(self):
+        """Do changes to one get_sa_data() result leak into later calls?"""
+        first = get_sa_data(path)
+        first['sample-output1'][0].loc[0, 'S1'] = 123.0
+        first['sample-output1'][1]['vertex1'] = -999
+        second = get_sa_data(path)
+        assert_frame_equal(second['sample-output1'][0],
+                           comps[0]['sample-output1'][0])
+        self.assertNotIn('vertex1', second['sample-output1'][1])
+
+    def test_cache_invalidated_by_rewrite(self):
+        """Is a file re-parsed after it is rewritten?"""
+        _write_modified_sample(self.tmpdir, lambda data: data)
+        before = get_sa_data(self.tmpdir)['sample-output1'][0]
+        self.assertAlmostEqual(before.loc[0, 'S1'], 0.039173)
+        _write_modified_sample(
+            self.tmpdir,
+            lambda data: data.replace(b'Tmax 0.039173', b'Tmax 0.5', 1))
+        after = get_sa_data(self.tmpdir)['sample-output1'][0]
+        self.assertAlmostEqual(after.loc[0, 'S1'], 0.5)
+
+
+class TestOptionalBackends(unittest.TestCase):
+    """Do the optional pyarrow and numba code paths give the same results
+    as the pandas/numpy fallbacks?"""
+
+    def setUp(self):
+        self.has_pyarrow = data_processing._HAS_PYARROW
+        self.has_numba = data_processing._HAS_NUMBA
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        data_processing._HAS_PYARROW = self.has_pyarrow
+        data_processing._HAS_NUMBA = self.has_numba
+        shutil.rmtree(self.tmpdir)
+
+    def backends(self):
+        """All the (pyarrow, numba) combinations available here"""
+        for use_pyarrow in set([False, self.has_pyarrow]):
+            for use_numba in set([False, self.has_numba]):
+                yield use_pyarrow, use_numba
+
+    def test_backends_match_comparisons(self):
+        """Does every backend reproduce unittest_comparisons.pkl?"""
+        for use_pyarrow, use_numba in self.backends():
+            data_processing._HAS_PYARROW = use_pyarrow
+            data_processing._HAS_NUMBA = use_numba
+            name, sens = data_processing._read_sa_file(
+                path, 'analysis_sample-output1.txt')
+            assert_frame_equal(sens[0], comps[0]['sample-output1'][0])
+            assert_frame_equal(sens[1], comps[0]['sample-output1'][1])
+            name, sens = data_processing._read_sa_file(
+                path + 'without_second_order_indices/',
+                'analysis_sample-output3-no_second_order.txt')
+            assert_frame_equal(
+                sens[0], comps[1]['sample-output3-no_second_order'][0])
+            self.assertIs(sens[1], False)
+
+    def test_backends_agree_on_extra_whitespace(self):
+        """Do all backends parse files with runs of spaces the same way?"""
+        filename = _write_modified_sample(
+            self.tmpdir,
+            lambda data: data.replace(b' ', b'  ').replace(b'\n', b' \n'))
+        for use_pyarrow, use_numba in self.backends():
+            data_processing._HAS_PYARROW = use_pyarrow
+            data_processing._HAS_NUMBA = use_numba
+            name, sens = data_processing._read_sa_file(self.tmpdir, filename)
+            assert_frame_equal(sens[0], comps[0]['sample-output1'][0])
+            assert_frame_equal(sens[1], comps[0]['sample-output1'][1])
+
 
 class TestFindUnimportantParams(unittest.TestCase):
     """Tests for find_unimpotant_params()"""